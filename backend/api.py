@@ -4,6 +4,7 @@ from typing import List, Optional
 from database import get_db
 import schemas
 import services
+from rate_limit import check_rate_limit
 
 router = APIRouter()
 
@@ -64,6 +65,7 @@ def create_word(user_id: int, word: schemas.WordCreate, db: Session = Depends(ge
     db_user = services.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    check_rate_limit("create_word", user_id)
     return services.create_word(db=db, word=word, user_id=user_id)
 
 @router.get("/users/{user_id}/words/", response_model=List[schemas.WordResponse])
@@ -78,6 +80,7 @@ def read_words(
     db_user = services.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    check_rate_limit("read_words", user_id)
     words = services.get_words(db, user_id=user_id, skip=skip, limit=limit, language_id=language_id, search=search)
     return words
 
@@ -137,6 +140,7 @@ def practice_word(user_id: int, practice: schemas.PracticeSessionCreate, db: Ses
     db_user = services.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    check_rate_limit("practice_word", user_id)
     return services.practice_word(db, word_id=practice.word_id, user_id=user_id)
 
 @router.get("/users/{user_id}/practice/", response_model=List[schemas.PracticeSessionResponse])
@@ -0,0 +1,96 @@
+"""Benchmark contended practice submissions against a SQLite database.
+
+Every word gets several simultaneous submissions from a thread pool. Exactly
+one per word should create a session (day_number 1), the rest are rejected.
+Run with --no-lock to see the unguarded check-then-insert for comparison.
+
+    python bench_practice.py --words 50 --submissions 8 --workers 16
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException
+from models import Base, User, Language, Word, PracticeSession
+import argparse
+import os
+import tempfile
+import time
+import services
+
+
+@contextmanager
+def _no_lock(db, user_id, word_id):
+    yield
+
+
+def run(words: int, submissions: int, workers: int, lock: bool = True):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = SessionLocal()
+    user = User(username="bench", email="bench@example.com")
+    db.add(user)
+    db.commit()
+    language = Language(name="English", user_id=user.id)
+    db.add(language)
+    db.commit()
+    db_words = [Word(word=f"word{i}", meaning="meaning", language_id=language.id, user_id=user.id)
+                for i in range(words)]
+    db.add_all(db_words)
+    db.commit()
+    user_id = user.id
+    word_ids = [w.id for w in db_words]
+    db.close()
+
+    def submit(word_id):
+        session = SessionLocal()
+        try:
+            services.practice_word(session, word_id=word_id, user_id=user_id)
+            return True
+        except HTTPException:
+            return False
+        finally:
+            session.close()
+
+    original_lock = services.practice_lock
+    if not lock:
+        services.practice_lock = _no_lock
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(submit, [w for w in word_ids for _ in range(submissions)]))
+        elapsed = time.perf_counter() - start
+    finally:
+        services.practice_lock = original_lock
+
+    db = SessionLocal()
+    sessions = db.query(PracticeSession).all()
+    db.close()
+    engine.dispose()
+
+    return {
+        "submissions": len(results),
+        "created": sum(results),
+        "rows": len(sessions),
+        "duplicates": len(sessions) - len({s.word_id for s in sessions}),
+        "wrong_day_numbers": sum(1 for s in sessions if s.day_number != 1),
+        "seconds": elapsed,
+        "per_second": len(results) / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=50)
+    parser.add_argument("--submissions", type=int, default=8, help="concurrent submissions per word")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--no-lock", action="store_true", help="disable practice_lock for comparison")
+    args = parser.parse_args()
+
+    result = run(args.words, args.submissions, args.workers, lock=not args.no_lock)
+    print(f"{result['submissions']} submissions in {result['seconds']:.3f}s "
+          f"({result['per_second']:.0f}/s): {result['rows']} sessions, "
+          f"{result['duplicates']} duplicates, {result['wrong_day_numbers']} wrong day numbers")
@@ -0,0 +1,76 @@
+"""Measure the memory a user's word index retains per word.
+
+Builds an index from a SQLite database and compares the size estimate used
+for WORD_INDEX_MEMORY_BUDGET against what tracemalloc sees once the ORM
+objects are gone.
+
+    python bench_word_index.py --words 1000 --examples 2
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models import Base, User, Language, Word, Example, PracticeSession
+from datetime import date, timedelta
+import argparse
+import gc
+import tracemalloc
+import word_index
+
+
+def run(words: int, examples: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = SessionLocal()
+    user = User(username="bench", email="bench@example.com")
+    db.add(user)
+    db.commit()
+    language = Language(name="English", user_id=user.id)
+    db.add(language)
+    db.commit()
+    for i in range(words):
+        db_word = Word(word=f"word number {i}", meaning=f"the meaning of word number {i}",
+                       language_id=language.id, user_id=user.id)
+        db_word.examples = [Example(example_text=f"an example sentence {j} for word {i}")
+                            for j in range(examples)]
+        db.add(db_word)
+    db.commit()
+    for word_id in range(1, words + 1, 2):
+        db.add(PracticeSession(user_id=user.id, word_id=word_id,
+                               practice_date=date.today() - timedelta(days=1), day_number=1))
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    # Warm up SQLAlchemy's caches so they aren't counted
+    db = SessionLocal()
+    word_index.build_user_index(db, user_id)
+    db.close()
+    gc.collect()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    db = SessionLocal()
+    index = word_index.build_user_index(db, user_id)
+    db.close()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    engine.dispose()
+
+    return {
+        "words": len(index.words),
+        "estimated_per_word": index.size / len(index.words),
+        "measured_per_word": retained / len(index.words),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=1000)
+    parser.add_argument("--examples", type=int, default=2, help="examples per word")
+    args = parser.parse_args()
+
+    result = run(args.words, args.examples)
+    print(f"{result['words']} words: estimated {result['estimated_per_word']:.0f} bytes/word, "
+          f"measured {result['measured_per_word']:.0f} bytes/word")
@@ -0,0 +1,58 @@
+import os
+
+# Point the app at SQLite before database.py builds its engine
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import get_db
+from main import app
+from models import Base, User, Language
+import pytest
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}",
+                           connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def user(db):
+    db_user = User(username="alice", email="alice@example.com")
+    db.add(db_user)
+    db.commit()
+    return db_user
+
+
+@pytest.fixture
+def language(db, user):
+    db_language = Language(name="English", user_id=user.id)
+    db.add(db_language)
+    db.commit()
+    return db_language
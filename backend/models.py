@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Date, Boolean, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -70,3 +70,11 @@ class PracticeSession(Base):
     
     user = relationship("User", back_populates="practice_sessions")
     word = relationship("Word", back_populates="practice_sessions")
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+    
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)  # Unix timestamp
@@ -0,0 +1,191 @@
+from fastapi import HTTPException
+from sqlalchemy import case
+from sqlalchemy.exc import IntegrityError
+from models import RateLimitBucket
+from typing import Dict, Protocol, Tuple
+import math
+import os
+import threading
+import time
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_CAPACITY = int(os.getenv("RATE_LIMIT_CAPACITY", "30"))
+RATE_LIMIT_REFILL_PER_SECOND = float(os.getenv("RATE_LIMIT_REFILL_PER_SECOND", "5"))
+RATE_LIMIT_SWEEP_SECONDS = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", "60"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "database"
+
+def _validate(capacity: int, refill_per_second: float):
+    if capacity < 1:
+        raise ValueError("Rate limit capacity must be at least 1")
+    if refill_per_second <= 0:
+        raise ValueError("Rate limit refill per second must be greater than 0")
+
+_validate(RATE_LIMIT_CAPACITY, RATE_LIMIT_REFILL_PER_SECOND)
+
+
+# Token Bucket Backends
+class BucketBackend(Protocol):
+    """Stores token buckets. Implementations read their own wall clock so
+    buckets shared between processes refill consistently."""
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token from the bucket. Returns 0 if allowed, otherwise
+        the number of seconds until a token becomes available."""
+        ...
+
+
+def _take_token(tokens: float, updated_at: float, now: float, capacity: int, refill_per_second: float):
+    """Refill the bucket up to now and take a token. Returns the new token
+    count and 0, or the unchanged count and the seconds to wait."""
+    tokens = min(float(capacity), tokens + max(0.0, now - updated_at) * refill_per_second)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / refill_per_second
+
+
+class InMemoryBucketBackend:
+    """Keeps bucket state in this process, so each worker enforces its own
+    limit. Buckets that have refilled to capacity are dropped by a periodic
+    sweep, since they carry no state."""
+
+    def __init__(self, clock=time.time, sweep_seconds: float = RATE_LIMIT_SWEEP_SECONDS):
+        self.clock = clock
+        self.sweep_seconds = sweep_seconds
+        self._buckets: Dict[str, Tuple[float, float, int, float]] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = clock()
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        with self._lock:
+            now = self.clock()
+            if now - self._last_sweep >= self.sweep_seconds:
+                self._sweep(now)
+
+            tokens, updated_at, _, _ = self._buckets.get(key, (float(capacity), now, capacity, refill_per_second))
+            tokens, retry_after = _take_token(tokens, updated_at, now, capacity, refill_per_second)
+            self._buckets[key] = (tokens, now, capacity, refill_per_second)
+            return retry_after
+
+    def _sweep(self, now: float):
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket[0] + (now - bucket[1]) * bucket[3] < bucket[2]
+        }
+        self._last_sweep = now
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class DatabaseBucketBackend:
+    """Keeps buckets in the rate_limit_buckets table so all workers share one
+    limit. A token is taken with a single conditional UPDATE, so concurrent
+    workers can't both spend the last one. Full buckets are deleted by a
+    periodic sweep."""
+
+    def __init__(self, session_factory, clock=time.time, sweep_seconds: float = RATE_LIMIT_SWEEP_SECONDS):
+        self.session_factory = session_factory
+        self.clock = clock
+        self.sweep_seconds = sweep_seconds
+        self._last_sweep = clock()
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        try:
+            return self._take(key, capacity, refill_per_second)
+        except IntegrityError:
+            # Another worker created the bucket first; it exists now
+            return self._take(key, capacity, refill_per_second)
+
+    def _take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        db = self.session_factory()
+        try:
+            now = self.clock()
+            if now - self._last_sweep >= self.sweep_seconds:
+                self._last_sweep = now
+                db.query(RateLimitBucket).filter(
+                    RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * refill_per_second >= capacity
+                ).delete(synchronize_session=False)
+                db.commit()
+
+            # Refill and take in SQL; updated_at only moves forward when worker clocks disagree
+            refilled = case(
+                (RateLimitBucket.updated_at >= now, RateLimitBucket.tokens),
+                else_=RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * refill_per_second
+            )
+            refilled = case((refilled >= capacity, float(capacity)), else_=refilled)
+            taken = db.query(RateLimitBucket).filter(
+                RateLimitBucket.key == key,
+                refilled >= 1
+            ).update({
+                RateLimitBucket.tokens: refilled - 1,
+                RateLimitBucket.updated_at: case((RateLimitBucket.updated_at >= now, RateLimitBucket.updated_at), else_=now)
+            }, synchronize_session=False)
+            if taken:
+                db.commit()
+                return 0.0
+
+            bucket = db.query(RateLimitBucket).filter(RateLimitBucket.key == key).first()
+            if bucket is None:
+                db.add(RateLimitBucket(key=key, tokens=float(capacity - 1), updated_at=now))
+                db.commit()
+                return 0.0
+
+            tokens, updated_at = bucket.tokens, bucket.updated_at
+            db.rollback()
+            _, retry_after = _take_token(tokens, updated_at, now, capacity, refill_per_second)
+            return retry_after
+        finally:
+            db.close()
+
+    def __len__(self):
+        db = self.session_factory()
+        try:
+            return db.query(RateLimitBucket).count()
+        finally:
+            db.close()
+
+
+def create_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == "memory":
+        return InMemoryBucketBackend()
+    if name == "database":
+        from database import SessionLocal
+        return DatabaseBucketBackend(SessionLocal)
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+class RateLimiter:
+    def __init__(self, backend: BucketBackend = None, capacity: int = RATE_LIMIT_CAPACITY,
+                 refill_per_second: float = RATE_LIMIT_REFILL_PER_SECOND):
+        _validate(capacity, refill_per_second)
+        self.backend = backend or InMemoryBucketBackend()
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    def check(self, scope: str, user_id: int):
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        key = f"{scope}:{user_id}"
+        retry_after = self.backend.take(key, self.capacity, self.refill_per_second)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+
+limiter = RateLimiter(create_backend())
+
+def set_backend(backend: BucketBackend):
+    """Replace the bucket store chosen by RATE_LIMIT_BACKEND"""
+    limiter.backend = backend
+
+def check_rate_limit(scope: str, user_id: int):
+    """Take a token for the user in the given scope; call after the user has been looked up"""
+    limiter.check(scope, user_id)
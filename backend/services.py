@@ -1,10 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, or_, text
 from models import User, Word, Example, PracticeSession, Language
 from schemas import UserCreate, WordCreate, WordUpdate, LanguageCreate, LanguageUpdate
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+import threading
 from fastapi import HTTPException
+from word_index import word_index, WORD_INDEX_ENABLED
 
 # User Services
 def create_user(db: Session, user: UserCreate):
@@ -57,6 +60,8 @@ def update_language(db: Session, language_id: int, user_id: int, language_update
     db_language.name = language_update.name
     db.commit()
     db.refresh(db_language)
+    if WORD_INDEX_ENABLED:
+        word_index.language_updated(user_id, language_id, db_language.name)
     return db_language
 
 def delete_language(db: Session, language_id: int, user_id: int):
@@ -67,6 +72,8 @@ def delete_language(db: Session, language_id: int, user_id: int):
     # This will cascade delete all words in this language
     db.delete(db_language)
     db.commit()
+    if WORD_INDEX_ENABLED:
+        word_index.language_deleted(user_id, language_id)
     return True
 
 
@@ -94,6 +101,8 @@ def create_word(db: Session, word: WordCreate, user_id: int):
     
     db.commit()
     db.refresh(db_word)
+    if WORD_INDEX_ENABLED:
+        word_index.word_saved(db_word)
     return db_word
 
 def get_word(db: Session, word_id: int):
@@ -101,17 +110,23 @@ def get_word(db: Session, word_id: int):
 
 def get_words(db: Session, user_id: int, skip: int = 0, limit: int = 100, 
               language_id: Optional[int] = None, search: Optional[str] = None):
+    if WORD_INDEX_ENABLED:
+        return word_index.get_words(db, user_id, skip=skip, limit=limit,
+                                    language_id=language_id, search=search)
+    
     query = db.query(Word).filter(Word.user_id == user_id)
     
     if language_id:
         query = query.filter(Word.language_id == language_id)
     
     if search:
-        search_term = f"%{search}%"
+        # Escape LIKE wildcards so the search is a plain substring match
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        search_term = f"%{escaped}%"
         query = query.filter(
             or_(
-                Word.word.ilike(search_term),
-                Word.meaning.ilike(search_term)
+                Word.word.ilike(search_term, escape="\\"),
+                Word.meaning.ilike(search_term, escape="\\")
             )
         )
     
@@ -170,6 +185,8 @@ def update_word(db: Session, word_id: int, user_id: int, word_update: WordUpdate
     
     db.commit()
     db.refresh(db_word)
+    if WORD_INDEX_ENABLED:
+        word_index.word_saved(db_word)
     return db_word
 
 def delete_word(db: Session, word_id: int, user_id: int):
@@ -179,48 +196,84 @@ def delete_word(db: Session, word_id: int, user_id: int):
     
     db.delete(db_word)
     db.commit()
+    if WORD_INDEX_ENABLED:
+        word_index.word_deleted(user_id, word_id)
     return True
 
 
 # Practice Services
+_practice_locks: Dict[Tuple[int, int], list] = {}
+_practice_locks_guard = threading.Lock()
+
+@contextmanager
+def practice_lock(db: Session, user_id: int, word_id: int):
+    """Serialize practice submissions for one (user, word) pair.
+
+    A per-pair thread lock covers requests handled by this process. On
+    PostgreSQL a transaction-level advisory lock is also taken so other
+    workers are serialized too; it is released when the session commits.
+    Submissions for different words never wait on each other.
+    """
+    key = (user_id, word_id)
+    with _practice_locks_guard:
+        entry = _practice_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+
+    entry[0].acquire()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:user_id, :word_id)"),
+                       {"user_id": user_id, "word_id": word_id})
+        yield
+    finally:
+        entry[0].release()
+        with _practice_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _practice_locks[key]
+
 def practice_word(db: Session, word_id: int, user_id: int):
     # Check if word exists and belongs to user
     word = get_word(db, word_id)
     if not word or word.user_id != user_id:
         raise HTTPException(status_code=404, detail="Word not found")
     
-    # Check if already practiced today
-    today = date.today()
-    existing_practice = db.query(PracticeSession).filter(
-        and_(
-            PracticeSession.word_id == word_id,
-            PracticeSession.user_id == user_id,
-            PracticeSession.practice_date == today
-        )
-    ).first()
+    # Lock so concurrent submissions can't both pass the checks below
+    with practice_lock(db, user_id, word_id):
+        # Check if already practiced today
+        today = date.today()
+        existing_practice = db.query(PracticeSession).filter(
+            and_(
+                PracticeSession.word_id == word_id,
+                PracticeSession.user_id == user_id,
+                PracticeSession.practice_date == today
+            )
+        ).first()
     
-    if existing_practice:
-        raise HTTPException(status_code=400, detail="Word already practiced today")
+        if existing_practice:
+            raise HTTPException(status_code=400, detail="Word already practiced today")
     
-    # Check if already completed 7 days
-    practice_count = db.query(PracticeSession).filter(
-        PracticeSession.word_id == word_id,
-        PracticeSession.user_id == user_id
-    ).count()
+        # Check if already completed 7 days
+        practice_count = db.query(PracticeSession).filter(
+            PracticeSession.word_id == word_id,
+            PracticeSession.user_id == user_id
+        ).count()
     
-    if practice_count >= 7:
-        raise HTTPException(status_code=400, detail="Word practice already completed (7 days)")
+        if practice_count >= 7:
+            raise HTTPException(status_code=400, detail="Word practice already completed (7 days)")
     
-    # Create new practice session
-    practice_session = PracticeSession(
-        user_id=user_id,
-        word_id=word_id,
-        practice_date=today,
-        day_number=practice_count + 1
-    )
-    db.add(practice_session)
-    db.commit()
-    db.refresh(practice_session)
+        # Create new practice session
+        practice_session = PracticeSession(
+            user_id=user_id,
+            word_id=word_id,
+            practice_date=today,
+            day_number=practice_count + 1
+        )
+        db.add(practice_session)
+        db.commit()
+        db.refresh(practice_session)
+        if WORD_INDEX_ENABLED:
+            word_index.practice_recorded(user_id, word_id, practice_session.day_number, today)
     
     return practice_session
 
@@ -232,6 +285,9 @@ def get_practice_history(db: Session, user_id: int, word_id: Optional[int] = Non
 
 def get_words_to_practice_today(db: Session, user_id: int):
     """Get words that can be practiced today (not practiced today and less than 7 days)"""
+    if WORD_INDEX_ENABLED:
+        return word_index.get_words_to_practice_today(db, user_id)
+    
     today = date.today()
     
     # Get all user's words
@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import rate_limit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = rate_limit.RateLimiter(capacity=2, refill_per_second=1.0)
+    monkeypatch.setattr(rate_limit, "limiter", limiter)
+    return limiter
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    backend = rate_limit.InMemoryBucketBackend(clock=clock)
+
+    assert backend.take("k", 2, 1.0) == 0
+    assert backend.take("k", 2, 1.0) == 0
+    assert backend.take("k", 2, 1.0) == pytest.approx(1.0)
+
+    clock.now += 1
+    assert backend.take("k", 2, 1.0) == 0
+
+
+def test_sweep_drops_full_buckets():
+    clock = FakeClock()
+    backend = rate_limit.InMemoryBucketBackend(clock=clock, sweep_seconds=10)
+    backend.take("idle", 2, 1.0)
+    for _ in range(3):
+        backend.take("busy", 2, 0.01)
+
+    clock.now += 10
+    backend.take("other", 2, 1.0)
+
+    assert len(backend) == 2  # "idle" refilled and was dropped
+
+
+def test_database_backend_is_shared(session_factory):
+    clock = FakeClock()
+    worker_a = rate_limit.DatabaseBucketBackend(session_factory, clock=clock)
+    worker_b = rate_limit.DatabaseBucketBackend(session_factory, clock=clock)
+
+    assert worker_a.take("k", 2, 1.0) == 0
+    assert worker_b.take("k", 2, 1.0) == 0
+    assert worker_a.take("k", 2, 1.0) == pytest.approx(1.0)
+
+    clock.now += 1
+    assert worker_b.take("k", 2, 1.0) == 0
+
+
+def test_database_backend_under_contention(session_factory):
+    backend = rate_limit.DatabaseBucketBackend(session_factory)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: backend.take("k", 5, 0.001), range(20)))
+
+    assert sum(1 for retry_after in results if retry_after == 0) == 5
+
+
+def test_database_backend_sweep_drops_full_buckets(session_factory):
+    clock = FakeClock()
+    backend = rate_limit.DatabaseBucketBackend(session_factory, clock=clock, sweep_seconds=10)
+    backend.take("idle", 2, 1.0)
+
+    clock.now += 10
+    backend.take("other", 2, 1.0)
+
+    assert len(backend) == 1
+
+
+def test_create_backend():
+    assert isinstance(rate_limit.create_backend("memory"), rate_limit.InMemoryBucketBackend)
+    assert isinstance(rate_limit.create_backend("database"), rate_limit.DatabaseBucketBackend)
+    with pytest.raises(ValueError):
+        rate_limit.create_backend("redis")
+
+
+def test_invalid_config_rejected():
+    with pytest.raises(ValueError):
+        rate_limit.RateLimiter(capacity=1, refill_per_second=0)
+    with pytest.raises(ValueError):
+        rate_limit.RateLimiter(capacity=0, refill_per_second=1)
+
+
+def test_set_backend(limiter):
+    backend = rate_limit.InMemoryBucketBackend()
+    rate_limit.set_backend(backend)
+    rate_limit.check_rate_limit("read_words", 1)
+    assert len(backend) == 1
+
+
+def test_over_limit_returns_429(client, user, limiter):
+    url = f"/api/v1/users/{user.id}/words/"
+    assert client.get(url).status_code == 200
+    assert client.get(url).status_code == 200
+
+    response = client.get(url)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_unknown_user_does_not_create_buckets(client, limiter):
+    for user_id in range(1000, 1050):
+        assert client.get(f"/api/v1/users/{user_id}/words/").status_code == 404
+    assert len(limiter.backend) == 0
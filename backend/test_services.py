@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from models import Word, PracticeSession
+import services
+
+
+def test_concurrent_practice_creates_one_session(session_factory, db, user, language):
+    word = Word(word="hello", meaning="greeting", language_id=language.id, user_id=user.id)
+    db.add(word)
+    db.commit()
+
+    def submit(_):
+        session = session_factory()
+        try:
+            services.practice_word(session, word_id=word.id, user_id=user.id)
+            return True
+        except HTTPException:
+            return False
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(submit, range(16)))
+
+    sessions = db.query(PracticeSession).all()
+    assert sum(results) == 1
+    assert [s.day_number for s in sessions] == [1]
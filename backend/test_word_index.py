@@ -0,0 +1,126 @@
+from datetime import date
+from models import PracticeSession, Word
+import bench_word_index
+import pytest
+import schemas
+import services
+import word_index
+
+
+@pytest.fixture
+def index(monkeypatch):
+    cache = word_index.WordIndexCache()
+    monkeypatch.setattr(services, "word_index", cache)
+    return cache
+
+
+def _serialize(words):
+    return [schemas.WordResponse.model_validate(w).model_dump() for w in words]
+
+
+def _compare(monkeypatch, db, user_id, **filters):
+    enabled = services.WORD_INDEX_ENABLED
+    monkeypatch.setattr(services, "WORD_INDEX_ENABLED", True)
+    from_index = _serialize(services.get_words(db, user_id, **filters))
+    today_from_index = _serialize(services.get_words_to_practice_today(db, user_id))
+    monkeypatch.setattr(services, "WORD_INDEX_ENABLED", False)
+    assert from_index == _serialize(services.get_words(db, user_id, **filters))
+    assert today_from_index == _serialize(services.get_words_to_practice_today(db, user_id))
+    monkeypatch.setattr(services, "WORD_INDEX_ENABLED", enabled)
+
+
+def _create_words(db, user, language):
+    german = services.create_language(db, schemas.LanguageCreate(name="German"), user.id)
+    for i, (word, meaning) in enumerate([("Hello", "a greeting"), ("100%", "all of it"),
+                                         ("snake_case", "naming style"), ("Haus", "house")]):
+        language_id = german.id if word == "Haus" else language.id
+        services.create_word(db, schemas.WordCreate(word=word, meaning=meaning, language_id=language_id,
+                                                    examples=[f"example {i}"]), user.id)
+    return german
+
+
+@pytest.mark.parametrize("filters", [
+    {}, {"search": "HEL"}, {"search": "%"}, {"search": "_"}, {"search": "a"},
+    {"skip": 1, "limit": 2},
+])
+def test_index_matches_db(monkeypatch, db, user, language, index, filters):
+    _create_words(db, user, language)
+    _compare(monkeypatch, db, user.id, **filters)
+
+
+def test_index_matches_db_after_writes(monkeypatch, db, user, language, index):
+    german = _create_words(db, user, language)
+    monkeypatch.setattr(services, "WORD_INDEX_ENABLED", True)
+    services.get_words(db, user.id)
+
+    services.practice_word(db, word_id=1, user_id=user.id)
+    services.update_word(db, 2, user.id, schemas.WordUpdate(word="Bye", meaning="farewell",
+                                                             language_id=german.id, examples=["x"]))
+    services.delete_word(db, 3, user.id)
+    services.update_language(db, german.id, user.id, schemas.LanguageUpdate(name="Deutsch"))
+    _compare(monkeypatch, db, user.id)
+    _compare(monkeypatch, db, user.id, language_id=german.id)
+
+    services.delete_language(db, german.id, user.id)
+    _compare(monkeypatch, db, user.id)
+
+
+def test_practice_hook_is_idempotent(db, user, language, index):
+    _create_words(db, user, language)
+    db.add(PracticeSession(user_id=user.id, word_id=1, practice_date=date.today(), day_number=1))
+    db.commit()
+
+    user_index = index.get(db, user.id)
+    index.practice_recorded(user.id, 1, 1, date.today())
+
+    assert user_index.words[1].practice_count == 1
+
+
+def test_other_users_writes_do_not_block_caching(monkeypatch, db, user, language, index):
+    _create_words(db, user, language)
+    build = word_index.build_user_index
+
+    def build_with_concurrent_write(db, user_id):
+        index.word_deleted(user_id + 1, 1)
+        return build(db, user_id)
+
+    monkeypatch.setattr(word_index, "build_user_index", build_with_concurrent_write)
+    index.get(db, user.id)
+    assert user.id in index._indexes
+
+
+def test_same_user_write_during_build_is_not_cached(monkeypatch, db, user, language, index):
+    _create_words(db, user, language)
+    build = word_index.build_user_index
+
+    def build_with_concurrent_write(db, user_id):
+        index.word_deleted(user_id, 1)
+        return build(db, user_id)
+
+    monkeypatch.setattr(word_index, "build_user_index", build_with_concurrent_write)
+    index.get(db, user.id)
+    assert user.id not in index._indexes
+    assert index._builds == {}
+
+
+def test_writes_without_builds_are_not_tracked(monkeypatch, db, user, language, index):
+    monkeypatch.setattr(services, "WORD_INDEX_ENABLED", True)
+    _create_words(db, user, language)
+    services.delete_word(db, 1, user.id)
+    assert index._builds == {}
+
+
+def test_records_stay_in_id_order(db, user, language, index):
+    _create_words(db, user, language)
+    user_index = index.get(db, user.id)
+    words = list(user_index.words.values())
+    user_index.remove(words[1].id)
+
+    user_index.put(db.query(Word).filter(Word.id == words[1].id).first())
+
+    assert list(user_index.words) == sorted(user_index.words)
+
+
+def test_size_estimate_matches_tracemalloc():
+    result = bench_word_index.run(words=300, examples=2)
+    assert result["estimated_per_word"] == pytest.approx(result["measured_per_word"], rel=0.15)
@@ -0,0 +1,314 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models import Word, PracticeSession
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional
+import os
+import sys
+import threading
+
+WORD_INDEX_ENABLED = os.getenv("WORD_INDEX_ENABLED", "false").lower() == "true"
+WORD_INDEX_MEMORY_BUDGET = int(os.getenv("WORD_INDEX_MEMORY_BUDGET", str(64 * 1024 * 1024)))
+
+
+# Records
+# Plain __slots__ objects exposing the same attributes as the ORM models,
+# so the response schemas can serialize them with from_attributes.
+class LanguageRecord:
+    __slots__ = ("id", "name", "user_id", "created_at")
+
+    def __init__(self, id, name, user_id, created_at):
+        self.id = id
+        self.name = name
+        self.user_id = user_id
+        self.created_at = created_at
+
+
+class ExampleRecord:
+    __slots__ = ("id", "example_text", "word_id", "created_at")
+
+    def __init__(self, id, example_text, word_id, created_at):
+        self.id = id
+        self.example_text = example_text
+        self.word_id = word_id
+        self.created_at = created_at
+
+
+class WordRecord:
+    __slots__ = ("id", "word", "meaning", "language_id", "user_id", "created_at",
+                 "examples", "language", "search_text", "practice_count",
+                 "last_practice_date", "size")
+
+    def __init__(self, id, word, meaning, language_id, user_id, created_at, examples, language):
+        self.id = id
+        self.word = word
+        self.meaning = meaning
+        self.language_id = language_id
+        self.user_id = user_id
+        self.created_at = created_at
+        self.examples = examples
+        self.language = language
+        self.search_text = (word.lower(), meaning.lower())
+        self.practice_count = 0
+        self.last_practice_date = None
+        self.size = 0
+
+    def can_practice(self, today: date):
+        return self.practice_count < 7 and self.last_practice_date != today
+
+
+# Average bytes a dict entry costs, including the spare slots kept as the
+# table grows; calibrated against tracemalloc with bench_word_index.py
+_DICT_ENTRY_SIZE = 48
+
+def _int_size(value):
+    # Small ints are shared singletons and cost nothing per record
+    return 0 if value is None or -5 <= value <= 256 else sys.getsizeof(value)
+
+def _record_size(record: WordRecord):
+    """Approximate bytes retained by a word record and its entry in the
+    index (the shared language record is not counted)"""
+    size = sys.getsizeof(record) + _DICT_ENTRY_SIZE
+    size += sys.getsizeof(record.word) + sys.getsizeof(record.meaning)
+    size += sys.getsizeof(record.search_text) + sum(sys.getsizeof(text) for text in record.search_text)
+    size += sys.getsizeof(record.created_at)
+    size += _int_size(record.id) + _int_size(record.user_id) + _int_size(record.language_id)
+    if record.last_practice_date is not None:
+        size += sys.getsizeof(record.last_practice_date)
+    size += sys.getsizeof(record.examples)
+    for example in record.examples:
+        size += sys.getsizeof(example) + sys.getsizeof(example.example_text)
+        size += sys.getsizeof(example.created_at)
+        size += _int_size(example.id) + _int_size(example.word_id)
+    # The size slot holds an int object of its own
+    return size + sys.getsizeof(size)
+
+
+# Per-user Index
+class UserWordIndex:
+    """A user's word records, kept in id order to match the DB path.
+
+    Each index has its own lock, so reads and writes for different users
+    never wait on each other.
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.words: Dict[int, WordRecord] = {}
+        self.languages: Dict[int, LanguageRecord] = {}
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def put(self, db_word: Word, practice_count: int = 0, last_practice_date: Optional[date] = None):
+        with self.lock:
+            self._put(db_word, practice_count, last_practice_date)
+
+    def _put(self, db_word: Word, practice_count: int, last_practice_date: Optional[date]):
+        language = self.languages.get(db_word.language_id)
+        if language is None or language.name != db_word.language.name:
+            language = LanguageRecord(db_word.language.id, db_word.language.name,
+                                      db_word.language.user_id, db_word.language.created_at)
+            self.languages[language.id] = language
+
+        examples = tuple(
+            ExampleRecord(ex.id, ex.example_text, ex.word_id, ex.created_at)
+            for ex in db_word.examples
+        )
+        record = WordRecord(db_word.id, db_word.word, db_word.meaning, db_word.language_id,
+                            db_word.user_id, db_word.created_at, examples, language)
+
+        previous = self.words.get(record.id)
+        if previous is not None:
+            record.practice_count = previous.practice_count
+            record.last_practice_date = previous.last_practice_date
+            self.size -= previous.size
+        else:
+            record.practice_count = practice_count
+            record.last_practice_date = last_practice_date
+
+        record.size = _record_size(record)
+        self.size += record.size
+        # Replacing a key keeps its position; new ids normally arrive in
+        # increasing order, so the dict stays sorted without re-sorting
+        out_of_order = previous is None and self.words and record.id < next(reversed(self.words))
+        self.words[record.id] = record
+        if out_of_order:
+            self.words = dict(sorted(self.words.items()))
+
+    def remove(self, word_id: int):
+        with self.lock:
+            self._remove(word_id)
+
+    def _remove(self, word_id: int):
+        record = self.words.pop(word_id, None)
+        if record is not None:
+            self.size -= record.size
+
+    def rename_language(self, language_id: int, name: str):
+        with self.lock:
+            if language_id in self.languages:
+                self.languages[language_id].name = name
+
+    def remove_language(self, language_id: int):
+        with self.lock:
+            for word_id in [r.id for r in self.words.values() if r.language_id == language_id]:
+                self._remove(word_id)
+            self.languages.pop(language_id, None)
+
+    def record_practice(self, word_id: int, day_number: int, practice_date: date):
+        with self.lock:
+            record = self.words.get(word_id)
+            if record is not None:
+                record.practice_count = day_number
+                record.last_practice_date = practice_date
+
+    def filter_words(self, skip: int = 0, limit: int = 100,
+                     language_id: Optional[int] = None, search: Optional[str] = None):
+        search_term = search.lower() if search else None
+        matches = []
+        with self.lock:
+            for record in self.words.values():
+                if language_id and record.language_id != language_id:
+                    continue
+                if search_term and search_term not in record.search_text[0] \
+                        and search_term not in record.search_text[1]:
+                    continue
+                matches.append(record)
+                if len(matches) == skip + limit:
+                    break
+        return matches[skip:skip + limit]
+
+    def words_to_practice(self, today: date):
+        with self.lock:
+            return [record for record in self.words.values() if record.can_practice(today)]
+
+
+def build_user_index(db: Session, user_id: int):
+    """Load all of a user's words with their practice state in a single query"""
+    stats = db.query(
+        PracticeSession.word_id.label("word_id"),
+        func.count(PracticeSession.id).label("practice_count"),
+        func.max(PracticeSession.practice_date).label("last_practice_date")
+    ).filter(
+        PracticeSession.user_id == user_id
+    ).group_by(PracticeSession.word_id).subquery()
+
+    rows = db.query(Word, stats.c.practice_count, stats.c.last_practice_date).outerjoin(
+        stats, stats.c.word_id == Word.id
+    ).filter(Word.user_id == user_id).order_by(Word.id).all()
+
+    index = UserWordIndex(user_id)
+    for db_word, practice_count, last_practice_date in rows:
+        index._put(db_word, practice_count or 0, last_practice_date)
+    return index
+
+
+# Index Cache
+class WordIndexCache:
+    """LRU cache of per-user indexes, evicting least recently used users
+    once the approximate memory budget is exceeded.
+
+    The cache is per process and only sees writes made through services,
+    so it is opt-in (WORD_INDEX_ENABLED) for single-worker deployments.
+    """
+
+    def __init__(self, memory_budget: int = WORD_INDEX_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self._indexes: "OrderedDict[int, UserWordIndex]" = OrderedDict()
+        self._lock = threading.RLock()
+        # user_id -> [builds in progress, writes seen since the first started]
+        self._builds: Dict[int, list] = {}
+
+    def get(self, db: Session, user_id: int):
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None:
+                self._indexes.move_to_end(user_id)
+                return index
+            build = self._builds.setdefault(user_id, [0, 0])
+            build[0] += 1
+            generation = build[1]
+
+        try:
+            index = build_user_index(db, user_id)
+        finally:
+            with self._lock:
+                build[0] -= 1
+                if build[0] == 0:
+                    del self._builds[user_id]
+
+        with self._lock:
+            # A write during the build may be missing from it; serve it once but don't cache it
+            if build[1] != generation:
+                return index
+            # Another request may have built it meanwhile; keep the first one
+            existing = self._indexes.get(user_id)
+            if existing is not None:
+                self._indexes.move_to_end(user_id)
+                return existing
+            self._indexes[user_id] = index
+            self._evict()
+            return index
+
+    def _evict(self):
+        total = sum(index.size for index in self._indexes.values())
+        while total > self.memory_budget and len(self._indexes) > 1:
+            _, index = self._indexes.popitem(last=False)
+            total -= index.size
+
+    def get_words(self, db: Session, user_id: int, skip: int = 0, limit: int = 100,
+                  language_id: Optional[int] = None, search: Optional[str] = None):
+        return self.get(db, user_id).filter_words(skip=skip, limit=limit,
+                                                  language_id=language_id, search=search)
+
+    def get_words_to_practice_today(self, db: Session, user_id: int):
+        return self.get(db, user_id).words_to_practice(date.today())
+
+    def memory_usage(self):
+        with self._lock:
+            return sum(index.size for index in self._indexes.values())
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def _loaded(self, user_id: int):
+        """Note a write for the user and return their index if it is loaded"""
+        with self._lock:
+            build = self._builds.get(user_id)
+            if build is not None:
+                build[1] += 1
+            return self._indexes.get(user_id)
+
+    # Write-through hooks; users whose index isn't loaded are skipped.
+    # Each hook sets absolute state so replaying it is harmless.
+    def word_saved(self, db_word: Word):
+        index = self._loaded(db_word.user_id)
+        if index is not None:
+            index.put(db_word)
+            with self._lock:
+                self._evict()
+
+    def word_deleted(self, user_id: int, word_id: int):
+        index = self._loaded(user_id)
+        if index is not None:
+            index.remove(word_id)
+
+    def language_updated(self, user_id: int, language_id: int, name: str):
+        index = self._loaded(user_id)
+        if index is not None:
+            index.rename_language(language_id, name)
+
+    def language_deleted(self, user_id: int, language_id: int):
+        index = self._loaded(user_id)
+        if index is not None:
+            index.remove_language(language_id)
+
+    def practice_recorded(self, user_id: int, word_id: int, day_number: int, practice_date: date):
+        index = self._loaded(user_id)
+        if index is not None:
+            index.record_practice(word_id, day_number, practice_date)
+
+
+word_index = WordIndexCache()